@@ -1,7 +1,7 @@
 """SQL MCP Server 配置定义。"""
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import sys
 
@@ -24,6 +24,14 @@ class Settings(BaseSettings):
     RESULT_STORAGE: Optional[Path] = None
     DEFAULT_DB_PATH: Optional[Path] = None
     READ_ONLY: bool = False
+    PROFILE_CACHE_SIZE: int = 64
+    PROFILE_SKETCH_ROWS: int = 100_000
+    EXPORT_CHUNK_SIZE: int = 5000
+    TRANSACTION_TIMEOUT_SECONDS: int = 300
+    MAX_TRANSACTIONS: int = 16
+    QUERY_COST_BUDGET: int = 100_000_000
+    DENIED_OPERATIONS: List[str] = []
+    MAX_BLOB_READ_BYTES: int = 1_048_576
 
     model_config = SettingsConfigDict(env_prefix="SQL_MCP_", extra="allow")
 
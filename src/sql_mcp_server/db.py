@@ -4,10 +4,22 @@ from __future__ import annotations
 
 import sqlite3
 import asyncio
+import functools
+import hashlib
+import itertools
+import logging
+import math
+import re
+import threading
+import time
+import uuid
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote
 
+logger = logging.getLogger("sql-mcp-server")
+
 
 class QueryResult:
     """封装查询结果。"""
@@ -37,53 +49,102 @@ class ExecutionError(Exception):
     """统一的执行异常。"""
 
 
-def _execute_sqlite(
-    db_path: Path,
-    statement: str,
-    max_rows: int,
-    read_only: bool = False,
-) -> QueryResult:
-    """在线程池中执行 SQLite 查询。"""
+def _connect(db_path: Path, read_only: bool = False) -> sqlite3.Connection:
+    """打开 SQLite 连接，只读模式使用 `mode=ro` URI。"""
     if not db_path.exists():
         raise ExecutionError(f"数据库文件不存在: {db_path}")
 
     path_str = db_path.resolve().as_posix()
     if read_only:
         uri = f"file:{quote(path_str, safe='/')}?mode=ro"
-        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
-    else:
-        conn = sqlite3.connect(path_str, check_same_thread=False)
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+    return sqlite3.connect(path_str, check_same_thread=False)
+
+
+def _quote_identifier(identifier: str) -> str:
+    """以双引号转义 SQL 标识符。"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+MAX_TEXT_CELL_CHARS = 1000
+
+
+def _summarize_blob(value: bytes) -> str:
+    """将 BLOB 概括为大小与哈希，完整内容可通过 `read_blob` 工具读取。"""
+    digest = hashlib.sha256(value).hexdigest()[:16]
+    return f"<blob {len(value)} bytes, sha256:{digest}>"
+
+
+def _summarize_text(value: str) -> str:
+    """保留长文本的前 `MAX_TEXT_CELL_CHARS` 个字符，其余部分以长度与哈希概括。"""
+    digest = hashlib.sha256(value.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    return f"{value[:MAX_TEXT_CELL_CHARS]}…<text {len(value)} chars, sha256:{digest}>"
+
+
+def _summarize_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return _summarize_blob(value)
+    if isinstance(value, str) and len(value) > MAX_TEXT_CELL_CHARS:
+        return _summarize_text(value)
+    return value
+
+
+def _collect_result(cur: sqlite3.Cursor, max_rows: int) -> QueryResult:
+    """从已执行的游标中读取至多 `max_rows` 行，BLOB 与长文本值以摘要代替。
+
+    游标逐行迭代，每行在读取下一行之前完成概括，内存中至多保留一行的原始值。
+    """
+    columns: List[str] = []
+    rows: List[Dict[str, Any]] = []
+
+    truncated = False
+    if cur.description:
+        columns = [col[0] for col in cur.description]
+        for idx, item in enumerate(itertools.islice(cur, max_rows + 1)):
+            row_dict = {col: _summarize_value(item[col]) for col in columns}
+            del item
+            rows.append(row_dict)
+            if idx + 1 >= max_rows:
+                truncated = True
+                rows = rows[:max_rows]
+                break
+
+    if not cur.description:
+        return QueryResult(columns=[], rows=[], rowcount=cur.rowcount)
+
+    return QueryResult(
+        columns=columns,
+        rows=rows,
+        rowcount=len(rows),
+        truncated=truncated,
+    )
+
+
+def _execute_sqlite(
+    db_path: Path,
+    statement: str,
+    max_rows: int,
+    read_only: bool = False,
+    policy: Optional[AdmissionPolicy] = None,
+) -> QueryResult:
+    """在线程池中执行 SQLite 查询，提供 `policy` 时先进行执行前检查。"""
+    conn = _connect(db_path, read_only)
     conn.row_factory = sqlite3.Row
+    if policy is not None:
+        # 授权回调在执行期间仍然生效，改用自动提交模式，避免 sqlite3 模块隐式发出的
+        # BEGIN/COMMIT 被 transaction 类别拒绝；单条语句本身仍是原子的
+        conn.isolation_level = None
     try:
+        if policy is not None:
+            _preflight(conn, db_path, statement, policy)
         cur = conn.cursor()
         cur.execute(statement)
-
-        columns: List[str] = []
-        rows: List[Dict[str, Any]] = []
-
-        truncated = False
-        if cur.description:
-            columns = [col[0] for col in cur.description]
-            for idx, item in enumerate(cur.fetchmany(max_rows + 1)):
-                row_dict = {col: item[col] for col in columns}
-                rows.append(row_dict)
-                if idx + 1 >= max_rows:
-                    truncated = True
-                    rows = rows[:max_rows]
-                    break
+        result = _collect_result(cur, max_rows)
 
         # 对于非查询语句，提交事务
-        if not cur.description:
-            if not read_only:
-                conn.commit()
-            return QueryResult(columns=[], rows=[], rowcount=cur.rowcount)
-
-        return QueryResult(
-            columns=columns,
-            rows=rows,
-            rowcount=len(rows),
-            truncated=truncated,
-        )
+        if not cur.description and not read_only:
+            conn.commit()
+        return result
     except sqlite3.Error as exc:
         if not read_only:
             conn.rollback()
@@ -97,6 +158,7 @@ async def execute_sqlite(
     statement: str,
     max_rows: int,
     read_only: bool = False,
+    policy: Optional[AdmissionPolicy] = None,
 ) -> QueryResult:
     """异步包装 SQLite 执行。"""
     return await asyncio.to_thread(
@@ -105,4 +167,926 @@ async def execute_sqlite(
         statement,
         max_rows,
         read_only,
+        policy,
+    )
+
+
+TRANSACTION_MODES = ("deferred", "immediate", "exclusive")
+_REAP_INTERVAL_SECONDS = 1.0
+
+
+class _Transaction:
+    """固定在单个连接上的显式事务。"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        conn: sqlite3.Connection,
+        read_only: bool,
+        idle_timeout: float,
+    ) -> None:
+        self.db_path = db_path
+        self.conn = conn
+        self.read_only = read_only
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+_TRANSACTIONS: Dict[str, _Transaction] = {}
+_TRANSACTIONS_LOCK = threading.Lock()
+_pending_begins = 0
+_reaper_task: Optional[asyncio.Task] = None
+
+
+def _get_transaction(transaction_id: str) -> _Transaction:
+    with _TRANSACTIONS_LOCK:
+        transaction = _TRANSACTIONS.get(transaction_id)
+    if transaction is None:
+        raise ExecutionError(f"事务 `{transaction_id}` 不存在或已结束。")
+    return transaction
+
+
+def _discard_transaction(transaction_id: str) -> None:
+    with _TRANSACTIONS_LOCK:
+        transaction = _TRANSACTIONS.pop(transaction_id, None)
+    if transaction is not None:
+        transaction.conn.close()
+
+
+def _begin_transaction(
+    db_path: Path,
+    read_only: bool = False,
+    mode: str = "deferred",
+    max_open: int = 16,
+    idle_timeout: float = 300,
+) -> str:
+    """打开连接并开始事务，返回事务句柄。"""
+    global _pending_begins
+    if mode not in TRANSACTION_MODES:
+        raise ExecutionError(f"不支持的事务模式: {mode}")
+    # 在锁内预占名额，连接与 BEGIN 期间的并发调用同样计入上限
+    with _TRANSACTIONS_LOCK:
+        if len(_TRANSACTIONS) + _pending_begins >= max_open:
+            raise ExecutionError(f"打开的事务数量已达上限 {max_open}。")
+        _pending_begins += 1
+
+    try:
+        conn = _connect(db_path, read_only)
+        # 由调用方显式控制 BEGIN/COMMIT，关闭 sqlite3 模块的隐式事务管理
+        conn.isolation_level = None
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute(f"BEGIN {mode.upper()};")
+        except sqlite3.Error as exc:
+            conn.close()
+            raise ExecutionError(str(exc)) from exc
+    except BaseException:
+        with _TRANSACTIONS_LOCK:
+            _pending_begins -= 1
+        raise
+
+    transaction_id = uuid.uuid4().hex
+    with _TRANSACTIONS_LOCK:
+        _pending_begins -= 1
+        _TRANSACTIONS[transaction_id] = _Transaction(db_path, conn, read_only, idle_timeout)
+    return transaction_id
+
+
+def _execute_in_transaction(
+    transaction_id: str,
+    statement: str,
+    max_rows: int,
+    policy: Optional[AdmissionPolicy] = None,
+) -> QueryResult:
+    """在事务固定的连接上执行语句，不提交也不关闭连接。"""
+    transaction = _get_transaction(transaction_id)
+    with transaction.lock:
+        if transaction_id not in _TRANSACTIONS:
+            raise ExecutionError(f"事务 `{transaction_id}` 不存在或已结束。")
+        transaction.last_used = time.monotonic()
+        try:
+            if policy is not None:
+                _preflight(transaction.conn, transaction.db_path, statement, policy)
+            cur = transaction.conn.cursor()
+            cur.execute(statement)
+            return _collect_result(cur, max_rows)
+        except sqlite3.Error as exc:
+            raise ExecutionError(str(exc)) from exc
+        finally:
+            # 授权回调只作用于本条语句，避免影响后续的 COMMIT/ROLLBACK
+            transaction.conn.set_authorizer(None)
+            transaction.last_used = time.monotonic()
+            # 语句自身结束了事务（COMMIT/ROLLBACK 或严重错误导致自动回滚）
+            if not transaction.conn.in_transaction:
+                _discard_transaction(transaction_id)
+
+
+def _finish_transaction(transaction_id: str, commit: bool) -> None:
+    """提交或回滚事务并释放连接。"""
+    transaction = _get_transaction(transaction_id)
+    with transaction.lock:
+        if transaction_id not in _TRANSACTIONS:
+            raise ExecutionError(f"事务 `{transaction_id}` 不存在或已结束。")
+        try:
+            if transaction.conn.in_transaction:
+                transaction.conn.execute("COMMIT;" if commit else "ROLLBACK;")
+        except sqlite3.Error as exc:
+            if transaction.conn.in_transaction:
+                # 提交失败（例如 SQLITE_BUSY）时保留事务，调用方可重试或回滚
+                raise ExecutionError(str(exc)) from exc
+            _discard_transaction(transaction_id)
+            raise ExecutionError(str(exc)) from exc
+        _discard_transaction(transaction_id)
+
+
+def _reap_transactions() -> List[str]:
+    """回滚空闲时间超过各自 `idle_timeout` 的事务，返回被回滚的句柄。"""
+    now = time.monotonic()
+    with _TRANSACTIONS_LOCK:
+        expired = [
+            (transaction_id, transaction)
+            for transaction_id, transaction in _TRANSACTIONS.items()
+            if now - transaction.last_used > transaction.idle_timeout
+        ]
+
+    reaped: List[str] = []
+    for transaction_id, transaction in expired:
+        # 正在执行语句的事务留待下一轮检查
+        if not transaction.lock.acquire(blocking=False):
+            continue
+        try:
+            if transaction_id not in _TRANSACTIONS:
+                continue
+            try:
+                if transaction.conn.in_transaction:
+                    transaction.conn.execute("ROLLBACK;")
+            except sqlite3.Error:
+                pass
+            _discard_transaction(transaction_id)
+            reaped.append(transaction_id)
+        finally:
+            transaction.lock.release()
+    return reaped
+
+
+async def _reap_loop() -> None:
+    """后台定期回滚被遗弃的事务，没有打开的事务时退出。"""
+    while _TRANSACTIONS:
+        await asyncio.sleep(_REAP_INTERVAL_SECONDS)
+        for transaction_id in await asyncio.to_thread(_reap_transactions):
+            logger.warning("事务 %s 空闲超时，已自动回滚", transaction_id)
+
+
+async def begin_transaction(
+    db_path: Path,
+    read_only: bool = False,
+    mode: str = "deferred",
+    max_open: int = 16,
+    idle_timeout: float = 300,
+) -> str:
+    """异步开始事务，并确保后台超时回滚任务在运行。"""
+    global _reaper_task
+    transaction_id = await asyncio.to_thread(
+        _begin_transaction,
+        db_path,
+        read_only,
+        mode,
+        max_open,
+        idle_timeout,
+    )
+    if _reaper_task is None or _reaper_task.done():
+        _reaper_task = asyncio.create_task(_reap_loop())
+    return transaction_id
+
+
+async def execute_in_transaction(
+    transaction_id: str,
+    statement: str,
+    max_rows: int,
+    policy: Optional[AdmissionPolicy] = None,
+) -> QueryResult:
+    """异步在事务中执行语句。"""
+    return await asyncio.to_thread(
+        _execute_in_transaction,
+        transaction_id,
+        statement,
+        max_rows,
+        policy,
+    )
+
+
+async def commit_transaction(transaction_id: str) -> None:
+    """异步提交事务。"""
+    await asyncio.to_thread(_finish_transaction, transaction_id, True)
+
+
+async def rollback_transaction(transaction_id: str) -> None:
+    """异步回滚事务。"""
+    await asyncio.to_thread(_finish_transaction, transaction_id, False)
+
+
+class BlobChunk:
+    """BLOB 的一段字节。"""
+
+    def __init__(self, data: bytes, offset: int, total_size: int):
+        self.data = data
+        self.offset = offset
+        self.total_size = total_size
+
+    @property
+    def end(self) -> int:
+        return self.offset + len(self.data)
+
+
+def _open_blob(
+    conn: sqlite3.Connection,
+    table_name: str,
+    column: str,
+    rowid: int,
+) -> sqlite3.Blob:
+    try:
+        return conn.blobopen(table_name, column, rowid, readonly=True)
+    except sqlite3.Error as exc:
+        raise ExecutionError(
+            f"无法打开 `{table_name}`.`{column}` 中 rowid={rowid} 的值: {exc}"
+        ) from exc
+
+
+def _read_blob(
+    db_path: Path,
+    table_name: str,
+    column: str,
+    rowid: int,
+    offset: int = 0,
+    length: int = 65536,
+) -> BlobChunk:
+    """通过增量 BLOB I/O 读取指定字节范围，不加载整个值。"""
+    conn = _connect(db_path, read_only=True)
+    try:
+        with _open_blob(conn, table_name, column, rowid) as blob:
+            total_size = len(blob)
+            offset = min(max(offset, 0), total_size)
+            blob.seek(offset)
+            data = blob.read(length)
+        return BlobChunk(data, offset, total_size)
+    except sqlite3.Error as exc:
+        raise ExecutionError(str(exc)) from exc
+    finally:
+        conn.close()
+
+
+async def read_blob(
+    db_path: Path,
+    table_name: str,
+    column: str,
+    rowid: int,
+    offset: int = 0,
+    length: int = 65536,
+) -> BlobChunk:
+    """异步读取 BLOB 字节范围。"""
+    return await asyncio.to_thread(
+        _read_blob,
+        db_path,
+        table_name,
+        column,
+        rowid,
+        offset,
+        length,
+    )
+
+
+_WATCHERS: Dict[str, Tuple[sqlite3.Connection, int]] = {}
+_WATCHERS_LOCK = threading.Lock()
+
+
+def _read_watcher_pragma(db_path: Path, pragma: str) -> int:
+    """通过长期存活的只读观察连接读取整数型 PRAGMA。
+
+    `data_version` 只在同一连接内可比较，因此每个数据库文件保留一个观察连接；
+    其他连接提交写入后，该值会递增。
+    """
+    path_key = db_path.resolve().as_posix()
+    try:
+        inode = db_path.stat().st_ino
+    except OSError as exc:
+        raise ExecutionError(f"数据库文件不存在: {db_path}") from exc
+
+    with _WATCHERS_LOCK:
+        watcher = _WATCHERS.get(path_key)
+        if watcher is not None and watcher[1] != inode:
+            # 文件被替换，旧连接观察的已不是同一个数据库
+            watcher[0].close()
+            watcher = None
+        if watcher is None:
+            watcher = (_connect(db_path, read_only=True), inode)
+            _WATCHERS[path_key] = watcher
+        try:
+            return int(watcher[0].execute(f"PRAGMA {pragma};").fetchone()[0])
+        except sqlite3.Error as exc:
+            raise ExecutionError(str(exc)) from exc
+
+
+def _data_version(db_path: Path) -> int:
+    """读取数据库的 `PRAGMA data_version`。"""
+    return _read_watcher_pragma(db_path, "data_version")
+
+
+def _schema_version(db_path: Path) -> int:
+    """读取数据库的 `PRAGMA schema_version`。"""
+    return _read_watcher_pragma(db_path, "schema_version")
+
+
+async def get_data_version(db_path: Path) -> int:
+    """异步读取数据库的 `data_version`。"""
+    return await asyncio.to_thread(_data_version, db_path)
+
+
+AUTHORIZER_CATEGORIES: Dict[str, frozenset] = {
+    "write": frozenset({sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE}),
+    "schema": frozenset(
+        {
+            sqlite3.SQLITE_CREATE_INDEX,
+            sqlite3.SQLITE_CREATE_TABLE,
+            sqlite3.SQLITE_CREATE_TEMP_INDEX,
+            sqlite3.SQLITE_CREATE_TEMP_TABLE,
+            sqlite3.SQLITE_CREATE_TEMP_TRIGGER,
+            sqlite3.SQLITE_CREATE_TEMP_VIEW,
+            sqlite3.SQLITE_CREATE_TRIGGER,
+            sqlite3.SQLITE_CREATE_VIEW,
+            sqlite3.SQLITE_CREATE_VTABLE,
+            sqlite3.SQLITE_DROP_INDEX,
+            sqlite3.SQLITE_DROP_TABLE,
+            sqlite3.SQLITE_DROP_TEMP_INDEX,
+            sqlite3.SQLITE_DROP_TEMP_TABLE,
+            sqlite3.SQLITE_DROP_TEMP_TRIGGER,
+            sqlite3.SQLITE_DROP_TEMP_VIEW,
+            sqlite3.SQLITE_DROP_TRIGGER,
+            sqlite3.SQLITE_DROP_VIEW,
+            sqlite3.SQLITE_DROP_VTABLE,
+            sqlite3.SQLITE_ALTER_TABLE,
+            sqlite3.SQLITE_REINDEX,
+            sqlite3.SQLITE_ANALYZE,
+        }
+    ),
+    "attach": frozenset({sqlite3.SQLITE_ATTACH, sqlite3.SQLITE_DETACH}),
+    "pragma": frozenset({sqlite3.SQLITE_PRAGMA}),
+    "transaction": frozenset({sqlite3.SQLITE_TRANSACTION, sqlite3.SQLITE_SAVEPOINT}),
+}
+
+# 无统计信息时的选择性假设，与 SQLite 查询规划器的默认值保持同一量级
+_EQUALITY_LOOKUP_ROWS = 10
+_RANGE_SELECTIVITY = 0.25
+
+_TABLE_REF_PATTERN = re.compile(
+    r'(?:\bFROM|\bJOIN|,)\s+("[^"]+"|\[[^\]]+\]|`[^`]+`|[A-Za-z_][\w.]*)'
+    r'(?:\s+(?:AS\s+)?("[^"]+"|[A-Za-z_]\w*))?',
+    re.IGNORECASE,
+)
+_NON_ALIAS_WORDS = frozenset(
+    {
+        "where", "on", "join", "left", "right", "full", "inner", "outer", "cross",
+        "natural", "group", "order", "limit", "using", "set", "union", "except",
+        "intersect", "window", "having", "from", "returning", "values", "indexed",
+        "not", "select", "as",
+    }
+)
+
+_WRITE_ACTIONS = AUTHORIZER_CATEGORIES["write"]
+_SCHEMA_TABLES = frozenset({"sqlite_master", "sqlite_temp_master"})
+
+# 仅匹配语句末尾的字面量 LIMIT，`LIMIT n OFFSET m` 与 `LIMIT m, n` 都按 n + m 计
+_LIMIT_PATTERN = re.compile(
+    r"\bLIMIT\s+(\d+)(?:\s*(?:,|\bOFFSET\b)\s*(\d+))?\s*;?\s*$",
+    re.IGNORECASE,
+)
+_AGGREGATE_PATTERN = re.compile(
+    r"\b(?:count|sum|avg|min|max|total|group_concat|string_agg)\s*\(|\bGROUP\s+BY\b|\bOVER\b",
+    re.IGNORECASE,
+)
+# 过滤条件会让外层循环为凑满 LIMIT 行而读取任意多行
+_FILTER_PATTERN = re.compile(r"\b(?:WHERE|ON|USING|NATURAL|HAVING)\b", re.IGNORECASE)
+_RECURSIVE_CTE_PATTERN = re.compile(
+    r'("[^"]+"|[A-Za-z_]\w*)\s*(?:\([^)]*\))?\s*AS\s*(?:NOT\s+)?(?:MATERIALIZED\s*)?\(',
+    re.IGNORECASE,
+)
+
+_ROW_COUNT_CACHE: Dict[Tuple[str, int, str], int] = {}
+_ROW_COUNT_CACHE_LIMIT = 4096
+
+
+class AdmissionPolicy:
+    """执行前检查策略。
+
+    `cost_budget` 为估算的访问行数上限，`None` 或 0 表示不限制；
+    `denied_operations` 为 `AUTHORIZER_CATEGORIES` 中需要拒绝的类别。
+    """
+
+    def __init__(
+        self,
+        cost_budget: Optional[float] = None,
+        denied_operations: Optional[List[str]] = None,
+        confirmed: bool = False,
+    ):
+        unknown = sorted(set(denied_operations or []) - set(AUTHORIZER_CATEGORIES))
+        if unknown:
+            raise ExecutionError(f"未知的操作类别: {', '.join(unknown)}")
+        self.cost_budget = cost_budget or None
+        self.denied_actions = frozenset().union(
+            *(AUTHORIZER_CATEGORIES[name] for name in denied_operations or [])
+        )
+        self.confirmed = confirmed
+
+
+class AdmissionError(ExecutionError):
+    """语句未通过执行前检查。"""
+
+    def __init__(
+        self,
+        message: str,
+        cost: Optional[float] = None,
+        reasons: Optional[List[str]] = None,
+    ):
+        super().__init__(message)
+        self.cost = cost
+        self.reasons = reasons or []
+
+
+def _unquote_identifier(identifier: str) -> str:
+    if identifier[:1] in ('"', "[", "`"):
+        return identifier[1:-1]
+    return identifier
+
+
+def _table_aliases(statement: str, tables: Dict[str, str]) -> Dict[str, str]:
+    """从语句文本中提取 `别名 -> 表名` 映射，仅保留真实存在的表。"""
+    aliases: Dict[str, str] = {}
+    for raw_name, raw_alias in _TABLE_REF_PATTERN.findall(statement):
+        name = _unquote_identifier(raw_name).split(".")[-1].lower()
+        if name not in tables:
+            continue
+        aliases[name] = tables[name]
+        if raw_alias and raw_alias.lower() not in _NON_ALIAS_WORDS:
+            aliases[_unquote_identifier(raw_alias).lower()] = tables[name]
+    return aliases
+
+
+def _table_row_count(conn: sqlite3.Connection, db_path: Path, table: str) -> int:
+    """估算表行数：优先 sqlite_stat1，其次 max(rowid)，最后才 COUNT(*)。
+
+    结果按 `data_version` 缓存，数据库被写入后自动失效。
+    """
+    cache_key = (db_path.resolve().as_posix(), _data_version(db_path), table)
+    cached = _ROW_COUNT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    count: Optional[int] = None
+    try:
+        row = conn.execute(
+            "SELECT stat FROM sqlite_stat1 WHERE tbl = ? ORDER BY idx IS NOT NULL LIMIT 1;",
+            (table,),
+        ).fetchone()
+        if row and row[0]:
+            count = int(str(row[0]).split()[0])
+    except (sqlite3.Error, ValueError):
+        pass
+    if count is None:
+        quoted = _quote_identifier(table)
+        try:
+            count = conn.execute(f"SELECT max(rowid) FROM {quoted};").fetchone()[0] or 0
+        except sqlite3.Error:
+            # WITHOUT ROWID 表没有 rowid，只能计数
+            count = conn.execute(f"SELECT COUNT(*) FROM {quoted};").fetchone()[0]
+
+    if len(_ROW_COUNT_CACHE) >= _ROW_COUNT_CACHE_LIMIT:
+        _ROW_COUNT_CACHE.clear()
+    _ROW_COUNT_CACHE[cache_key] = int(count)
+    return int(count)
+
+
+def _recursive_cte_limit(statement: str) -> Optional[int]:
+    """返回递归 CTE 自身 LIMIT 的最大值，任一递归 CTE 没有 LIMIT 时返回 `None`。"""
+    if not re.search(r"\bWITH\s+RECURSIVE\b", statement, re.IGNORECASE):
+        return None
+    limits: List[int] = []
+    for match in _RECURSIVE_CTE_PATTERN.finditer(statement):
+        depth = 1
+        end = match.end()
+        while end < len(statement) and depth:
+            depth += {"(": 1, ")": -1}.get(statement[end], 0)
+            end += 1
+        body = statement[match.end() : end - 1]
+        name = _unquote_identifier(match.group(1))
+        if not re.search(rf"\b{re.escape(name)}\b", body, re.IGNORECASE):
+            continue
+        limit_match = _LIMIT_PATTERN.search(body)
+        if depth or not limit_match:
+            return None
+        limits.append(int(limit_match.group(1)) + int(limit_match.group(2) or 0))
+    return max(limits, default=None)
+
+
+def _estimate_plan_cost(
+    plan: List[Tuple[int, int, str]],
+    row_counts: Dict[str, int],
+    default_rows: int,
+    limit: Optional[int] = None,
+    recursion_limit: Optional[int] = None,
+) -> Tuple[float, List[str]]:
+    """根据查询计划估算访问行数。
+
+    同一父节点下的 SCAN/SEARCH 步骤按嵌套循环相乘，子查询与物化步骤的代价相加，
+    相关子查询按外层行数重复计算。提供 `limit` 时最外层循环的行数以其为上限。
+    递归 CTE 的每一步按 `recursion_limit` 次迭代计算，没有上限时视为无界。
+    """
+    children: Dict[int, List[Tuple[int, str]]] = {}
+    for node_id, parent_id, detail in plan:
+        children.setdefault(parent_id, []).append((node_id, detail))
+    reasons: List[str] = []
+
+    def object_rows(name: str) -> int:
+        return row_counts.get(name.lower(), default_rows)
+
+    def subtree_cost(parent_id: int) -> float:
+        loop_rows = 1.0
+        total = 0.0
+        outer_cap = limit if parent_id == 0 else None
+        for node_id, detail in children.get(parent_id, []):
+            words = detail.split()
+            if len(words) > 2 and words[1] == "TABLE":
+                # 旧版本 SQLite 输出 `SCAN TABLE t` 形式
+                words = [words[0]] + words[2:]
+            if detail == "SCAN CONSTANT ROW":
+                continue
+            if words[0] == "SCAN" and len(words) > 1:
+                table_rows = object_rows(words[1])
+                step_rows = max(table_rows, 1)
+                if outer_cap is not None:
+                    step_rows, outer_cap = min(step_rows, outer_cap), None
+                loop_rows *= step_rows
+                total += loop_rows
+                if step_rows > _EQUALITY_LOOKUP_ROWS:
+                    reasons.append(f"全表扫描 `{words[1]}`（约 {table_rows} 行）")
+                total += subtree_cost(node_id)
+            elif words[0] == "SEARCH" and len(words) > 1:
+                table_rows = object_rows(words[1])
+                if "AUTOMATIC" in detail:
+                    # 每次执行都要临时建索引，通常意味着连接键上缺少索引
+                    total += table_rows * math.log2(table_rows + 2)
+                    reasons.append(f"`{words[1]}` 的连接键缺少索引，需临时建立自动索引")
+                if any(op in detail for op in (">", "<")):
+                    step_rows = max(table_rows * _RANGE_SELECTIVITY, 1.0)
+                elif "PRIMARY KEY" in detail:
+                    step_rows = 1.0
+                else:
+                    step_rows = float(min(_EQUALITY_LOOKUP_ROWS, max(table_rows, 1)))
+                if outer_cap is not None:
+                    step_rows, outer_cap = min(step_rows, outer_cap), None
+                loop_rows *= step_rows
+                total += loop_rows * math.log2(table_rows + 2)
+                total += subtree_cost(node_id)
+            elif detail.startswith("USE TEMP B-TREE"):
+                total += loop_rows * math.log2(loop_rows + 2)
+                target = detail.replace("USE TEMP B-TREE FOR", "").strip()
+                reasons.append(f"{target} 需要临时 B-树排序（约 {int(loop_rows)} 行）")
+            elif detail.startswith("CORRELATED"):
+                total += loop_rows * subtree_cost(node_id)
+            elif detail == "RECURSIVE STEP":
+                if recursion_limit is None:
+                    reasons.append("递归 CTE 没有 LIMIT，无法估计迭代次数")
+                    return math.inf
+                total += recursion_limit * max(subtree_cost(node_id), 1.0)
+            else:
+                total += subtree_cost(node_id)
+        return total
+
+    return subtree_cost(0), reasons
+
+
+def _preflight(
+    conn: sqlite3.Connection,
+    db_path: Path,
+    statement: str,
+    policy: AdmissionPolicy,
+) -> None:
+    """执行前检查：安装授权回调并估算代价，超出预算时抛出 `AdmissionError`。
+
+    授权回调保留在连接上，实际执行时同样生效。
+    """
+    reads: set = set()
+    denied: List[str] = []
+
+    def authorizer(
+        action: int,
+        arg1: Optional[str],
+        arg2: Optional[str],
+        db_name: Optional[str],
+        source: Optional[str],
+    ) -> int:
+        if action in policy.denied_actions:
+            if action in _WRITE_ACTIONS and arg1 in _SCHEMA_TABLES:
+                # 连接同名虚表（如 pragma_table_info、json_each）时 SQLite 会报告对
+                # sqlite_master 的写入；真正的结构修改由 schema 类别负责
+                return sqlite3.SQLITE_OK
+            category = next(
+                name for name, actions in AUTHORIZER_CATEGORIES.items() if action in actions
+            )
+            denied.append(category)
+            return sqlite3.SQLITE_DENY
+        if action == sqlite3.SQLITE_READ and arg1:
+            reads.add(arg1)
+        return sqlite3.SQLITE_OK
+
+    conn.set_authorizer(authorizer)
+    try:
+        plan = [
+            (int(row[0]), int(row[1]), str(row[3]))
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")
+        ]
+    except sqlite3.DatabaseError as exc:
+        if denied:
+            raise AdmissionError(f"语句包含被禁止的操作类别: {', '.join(sorted(set(denied)))}") from exc
+        # 语法错误等问题留给实际执行阶段报告
+        return
+
+    if policy.cost_budget is None or policy.confirmed or not plan:
+        return
+
+    tables = {
+        str(name).lower(): str(name)
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table';")
+    }
+    row_counts: Dict[str, int] = {}
+    for name in reads:
+        if name.lower() in tables:
+            row_counts[name.lower()] = _table_row_count(conn, db_path, tables[name.lower()])
+    for alias, table in _table_aliases(statement, tables).items():
+        row_counts[alias] = row_counts.get(table.lower()) or _table_row_count(conn, db_path, table)
+    default_rows = max(row_counts.values(), default=1)
+
+    # 计划中没有排序/聚合、语句也没有过滤条件时，外层循环产出 LIMIT 行即可结束
+    limit: Optional[int] = None
+    limit_match = _LIMIT_PATTERN.search(statement)
+    if (
+        limit_match
+        and not any(detail.startswith("USE TEMP B-TREE") for _, _, detail in plan)
+        and not _AGGREGATE_PATTERN.search(statement)
+        and not _FILTER_PATTERN.search(statement)
+    ):
+        limit = int(limit_match.group(1)) + int(limit_match.group(2) or 0)
+    recursion_limit = _recursive_cte_limit(statement)
+    if recursion_limit is None:
+        recursion_limit = limit
+
+    cost, reasons = _estimate_plan_cost(plan, row_counts, default_rows, limit, recursion_limit)
+    if cost > policy.cost_budget:
+        details = "\n".join(f"- {reason}" for reason in dict.fromkeys(reasons))
+        if math.isinf(cost):
+            message = "语句代价无法估计（可能无界），已拒绝执行。"
+        else:
+            message = (
+                f"语句估算代价约 {int(cost)} 行访问，超过预算 {int(policy.cost_budget)}，已拒绝执行。"
+            )
+        if details:
+            message = f"{message}\n\n{details}"
+        message = f"{message}\n\n_确认需要执行时请设置 `confirm=true`。_"
+        raise AdmissionError(message, cost=cost, reasons=reasons)
+
+
+def _estimate_distinct(frequencies: Counter, sampled: int, population: int) -> int:
+    """按 Haas-Stokes Duj1 估计总体不同值数量（与 PostgreSQL ANALYZE 相同）。
+
+    `frequencies` 为样本中各值的出现次数，`sampled` 为样本非空值数量，
+    `population` 为总体非空值数量。
+    """
+    if sampled <= 0:
+        return 0
+    if sampled >= population:
+        return len(frequencies)
+    singletons = sum(1 for count in frequencies.values() if count == 1)
+    denominator = 1 - (1 - sampled / population) * singletons / sampled
+    estimate = len(frequencies) / denominator if denominator > 0 else population
+    return int(min(max(estimate, len(frequencies)), population))
+
+
+class ColumnProfile:
+    """单列统计结果。"""
+
+    def __init__(
+        self,
+        name: str,
+        declared_type: str,
+        null_count: int,
+        distinct_estimate: int,
+        distinct_exact: bool,
+        minimum: Any,
+        maximum: Any,
+        top_values: List[Tuple[Any, int]],
+        top_exact: bool,
+    ):
+        self.name = name
+        self.declared_type = declared_type
+        self.null_count = null_count
+        self.distinct_estimate = distinct_estimate
+        self.distinct_exact = distinct_exact
+        self.minimum = minimum
+        self.maximum = maximum
+        self.top_values = top_values
+        self.top_exact = top_exact
+
+
+class TableProfile:
+    """整表统计结果。"""
+
+    def __init__(
+        self,
+        table_name: str,
+        scanned_rows: int,
+        columns: List[ColumnProfile],
+        sample_percent: Optional[float] = None,
+    ):
+        self.table_name = table_name
+        self.scanned_rows = scanned_rows
+        self.columns = columns
+        self.sample_percent = sample_percent
+
+    @property
+    def estimated_rows(self) -> int:
+        if not self.sample_percent:
+            return self.scanned_rows
+        return int(round(self.scanned_rows * 100 / self.sample_percent))
+
+
+def _sample_clause(rate: float) -> str:
+    """在 SQLite 内部完成伯努利采样，未选中的行不会进入 Python。"""
+    return f" WHERE {_sample_condition(rate)}"
+
+
+def _sample_condition(rate: float) -> str:
+    return f"(abs(random()) % 1000000) < {int(rate * 1_000_000)}"
+
+
+_PROFILE_VALUE_CHARS = 48
+
+
+def _profile_key(column: str) -> str:
+    """在 SQLite 内部将值归约为计数键，BLOB 与长文本不会以原值进入 Python。
+
+    BLOB 取长度与首尾 8 字节，超过 `_PROFILE_VALUE_CHARS` 的文本取前缀、末尾 8 个字符与长度。
+    """
+    return (
+        f"CASE typeof({column}) "
+        f"WHEN 'blob' THEN '<blob ' || length({column}) || ' bytes ' "
+        f"|| hex(substr({column}, 1, 8)) || '..' || hex(substr({column}, -8)) || '>' "
+        f"WHEN 'text' THEN CASE WHEN length({column}) > {_PROFILE_VALUE_CHARS} "
+        f"THEN substr({column}, 1, {_PROFILE_VALUE_CHARS}) || '…<' || length({column}) "
+        f"|| ' chars>' || substr({column}, -8) ELSE {column} END "
+        f"ELSE {column} END"
+    )
+
+
+def _profile_preview(expression: str) -> str:
+    """最小/最大值只以预览形式返回，缓存中不保留完整的大值。"""
+    return (
+        f"CASE typeof({expression}) "
+        f"WHEN 'blob' THEN '<blob ' || length({expression}) || ' bytes>' "
+        f"WHEN 'text' THEN substr({expression}, 1, {_PROFILE_VALUE_CHARS}) "
+        f"ELSE {expression} END"
+    )
+
+
+class _ValueSketch:
+    """聚合函数 `profile_sketch(slot, key)`，把样本中的键计入对应列的计数器。"""
+
+    def __init__(self, counters: List[Counter]) -> None:
+        self._counters = counters
+
+    def step(self, slot: int, key: Any) -> None:
+        self._counters[slot][key] += 1
+
+    def finalize(self) -> None:
+        return None
+
+
+def _profile_sqlite(
+    db_path: Path,
+    table_name: str,
+    top_k: int = 5,
+    sample_percent: Optional[float] = None,
+    read_only: bool = False,
+    sketch_rows: int = 100_000,
+) -> TableProfile:
+    """统计表中每列的信息，通常只扫描一次表。
+
+    行数、空值数与最小/最大值由 SQLite 内置聚合精确算出；同一条语句中的
+    `profile_sketch` 聚合通过 `FILTER` 只接收至多约 `sketch_rows` 行的样本，
+    据此计算不同值数量与高频值，超出时为估计值。样本比例按表的行数元数据
+    （`sqlite_stat1` 或 `max(rowid)`）确定：没有元数据的视图需要先计数一次，
+    元数据偏大而实际行数不超过 `sketch_rows` 时再精确扫描一次。
+    """
+    conn = _connect(db_path, read_only)
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ? AND type IN ('table', 'view');",
+            (table_name,),
+        ).fetchone()
+        if not exists:
+            raise ExecutionError(f"表或视图 `{table_name}` 不存在。")
+
+        table = _quote_identifier(table_name)
+        column_info = conn.execute(f"PRAGMA table_info({table});").fetchall()
+        names = [str(info[1]) for info in column_info]
+        declared_types = [str(info[2] or "") for info in column_info]
+        if not names:
+            return TableProfile(table_name, 0, [], sample_percent)
+
+        table_rate = sample_percent / 100 if sample_percent else 1.0
+        where = _sample_clause(table_rate) if sample_percent else ""
+        counters: List[Counter] = []
+        conn.create_aggregate("profile_sketch", 2, functools.partial(_ValueSketch, counters))
+
+        def scan(sketch_rate: float) -> Tuple[Any, ...]:
+            counters[:] = [Counter() for _ in names]
+            sketch_filter = ""
+            if sketch_rate < table_rate:
+                sketch_filter = f" AND {_sample_condition(sketch_rate / table_rate)}"
+            # 每列依次为非空数、最小值、最大值与样本计数聚合
+            aggregates = ", ".join(
+                f"COUNT({col}), {_profile_preview(f'MIN({col})')}, "
+                f"{_profile_preview(f'MAX({col})')}, "
+                f"profile_sketch({idx}, {_profile_key(col)}) "
+                f"FILTER (WHERE {col} IS NOT NULL{sketch_filter})"
+                for idx, col in enumerate(_quote_identifier(name) for name in names)
+            )
+            return conn.execute(f"SELECT COUNT(*), {aggregates} FROM {table}{where};").fetchone()
+
+        sketch_rate = table_rate
+        expected_rows = _table_row_count(conn, db_path, table_name) * table_rate
+        if expected_rows > sketch_rows:
+            sketch_rate *= sketch_rows / expected_rows
+        summary = scan(sketch_rate)
+        scanned_rows = int(summary[0])
+        if sketch_rate < table_rate and scanned_rows <= sketch_rows:
+            # 行数元数据偏大（例如删除后的 max(rowid)），实际行数很少，重新精确扫描代价很小
+            sketch_rate = table_rate
+            summary = scan(sketch_rate)
+            scanned_rows = int(summary[0])
+        exact = sketch_rate >= 1.0
+
+        columns: List[ColumnProfile] = []
+        for idx, (name, declared_type, counter) in enumerate(zip(names, declared_types, counters)):
+            non_null = int(summary[1 + 4 * idx])
+            # 采样时按比例换算为整表的非空行数
+            population = int(round(non_null / table_rate))
+            sampled = sum(counter.values())
+            if exact:
+                distinct = len(counter)
+                top_values = counter.most_common(top_k)
+            else:
+                distinct = _estimate_distinct(counter, sampled, population)
+                scale = population / sampled if sampled else 0.0
+                # 样本中只出现一次的值不足以说明其为高频值
+                top_values = [
+                    (value, int(round(count * scale)))
+                    for value, count in counter.most_common(top_k)
+                    if count > 1
+                ]
+            columns.append(
+                ColumnProfile(
+                    name=name,
+                    declared_type=declared_type,
+                    null_count=scanned_rows - non_null,
+                    distinct_estimate=min(distinct, population),
+                    distinct_exact=exact,
+                    minimum=summary[2 + 4 * idx],
+                    maximum=summary[3 + 4 * idx],
+                    top_values=top_values,
+                    top_exact=exact,
+                )
+            )
+        return TableProfile(table_name, scanned_rows, columns, sample_percent)
+    except sqlite3.Error as exc:
+        raise ExecutionError(str(exc)) from exc
+    finally:
+        conn.close()
+
+
+async def profile_sqlite(
+    db_path: Path,
+    table_name: str,
+    top_k: int = 5,
+    sample_percent: Optional[float] = None,
+    read_only: bool = False,
+    sketch_rows: int = 100_000,
+) -> TableProfile:
+    """异步包装表统计计算。"""
+    return await asyncio.to_thread(
+        _profile_sqlite,
+        db_path,
+        table_name,
+        top_k,
+        sample_percent,
+        read_only,
+        sketch_rows,
     )
@@ -0,0 +1,262 @@
+"""查询结果流式导出，按块读取游标并直接写入文件。"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from .db import AdmissionPolicy, ExecutionError, _connect, _open_blob, _preflight
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+ProgressCallback = Callable[[int], None]
+
+
+class ExportResult:
+    """封装导出结果。"""
+
+    def __init__(
+        self,
+        path: Path,
+        columns: List[str],
+        row_count: int,
+        size_bytes: int,
+        sha256: str,
+        elapsed_seconds: float,
+    ):
+        self.path = path
+        self.columns = columns
+        self.row_count = row_count
+        self.size_bytes = size_bytes
+        self.sha256 = sha256
+        self.elapsed_seconds = elapsed_seconds
+
+    def to_payload(self) -> dict:
+        return {
+            "path": self.path.as_posix(),
+            "columns": self.columns,
+            "row_count": self.row_count,
+            "size_bytes": self.size_bytes,
+            "sha256": self.sha256,
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+
+class _HashingWriter(io.RawIOBase):
+    """写入底层文件的同时计算 SHA-256 与字节数。"""
+
+    def __init__(self, raw: io.BufferedWriter) -> None:
+        self._raw = raw
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data)
+        self.digest.update(view)
+        self._raw.write(view)
+        self.size += view.nbytes
+        return view.nbytes
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+
+def _encode_value(value: Any) -> Any:
+    """BLOB 以 base64 文本导出，其余值保持原样。"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    return value
+
+
+def _temp_file(output_path: Path) -> Path:
+    """在目标目录中创建唯一的 `.part` 临时文件，避免并发导出互相覆盖。"""
+    with tempfile.NamedTemporaryFile(
+        dir=output_path.parent,
+        prefix=f"{output_path.name}.",
+        suffix=".part",
+        delete=False,
+    ) as handle:
+        return Path(handle.name)
+
+
+def _publish(part_path: Path, output_path: Path) -> None:
+    """以硬链接原子地发布临时文件，目标已存在时拒绝而不是覆盖。"""
+    try:
+        os.link(part_path, output_path)
+    except FileExistsError as exc:
+        raise ExecutionError(f"导出文件已存在: {output_path}") from exc
+    part_path.unlink()
+
+
+def _export_sqlite(
+    db_path: Path,
+    statement: str,
+    output_path: Path,
+    export_format: str = "csv",
+    compress: bool = False,
+    chunk_size: int = 5000,
+    progress: Optional[ProgressCallback] = None,
+    policy: Optional[AdmissionPolicy] = None,
+) -> ExportResult:
+    """执行查询并以固定内存将全部结果写入文件，提供 `policy` 时先进行执行前检查。
+
+    写入过程使用唯一的 `.part` 临时文件，成功后再原子发布，失败时删除临时文件。
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ExecutionError(f"不支持的导出格式: {export_format}")
+
+    started = time.perf_counter()
+    # 导出只读取数据，始终以只读模式连接，避免语句产生副作用
+    conn = _connect(db_path, read_only=True)
+    part_path = _temp_file(output_path)
+    try:
+        if policy is not None:
+            _preflight(conn, db_path, statement, policy)
+        cur = conn.execute(statement)
+        if not cur.description:
+            raise ExecutionError("导出仅支持返回结果集的查询语句。")
+        columns = [col[0] for col in cur.description]
+
+        row_count = 0
+        with open(part_path, "wb") as raw:
+            hashing = _HashingWriter(raw)
+            binary: io.BufferedIOBase
+            if compress:
+                binary = gzip.GzipFile(fileobj=hashing, mode="wb", compresslevel=6, mtime=0)
+            else:
+                binary = io.BufferedWriter(hashing)
+            with io.TextIOWrapper(binary, encoding="utf-8", newline="") as text:
+                csv_writer = None
+                if export_format == "csv":
+                    csv_writer = csv.writer(text)
+                    csv_writer.writerow(columns)
+                encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+                while True:
+                    batch = cur.fetchmany(chunk_size)
+                    if not batch:
+                        break
+                    if csv_writer is not None:
+                        csv_writer.writerows(
+                            [_encode_value(value) for value in row] for row in batch
+                        )
+                    else:
+                        text.writelines(
+                            encode_json(dict(zip(columns, map(_encode_value, row)))) + "\n"
+                            for row in batch
+                        )
+                    row_count += len(batch)
+                    if progress is not None:
+                        progress(row_count)
+
+        _publish(part_path, output_path)
+        return ExportResult(
+            path=output_path,
+            columns=columns,
+            row_count=row_count,
+            size_bytes=hashing.size,
+            sha256=hashing.digest.hexdigest(),
+            elapsed_seconds=time.perf_counter() - started,
+        )
+    except sqlite3.Error as exc:
+        raise ExecutionError(str(exc)) from exc
+    finally:
+        conn.close()
+        if part_path.exists():
+            part_path.unlink()
+
+
+def _export_blob(
+    db_path: Path,
+    table_name: str,
+    column: str,
+    rowid: int,
+    output_path: Path,
+    chunk_size: int = 1_048_576,
+) -> ExportResult:
+    """以增量 BLOB I/O 分块将单个值写入文件。"""
+    started = time.perf_counter()
+    conn = _connect(db_path, read_only=True)
+    part_path = _temp_file(output_path)
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with _open_blob(conn, table_name, column, rowid) as blob, open(part_path, "wb") as out:
+            while chunk := blob.read(chunk_size):
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        _publish(part_path, output_path)
+        return ExportResult(
+            path=output_path,
+            columns=[column],
+            row_count=1,
+            size_bytes=size,
+            sha256=digest.hexdigest(),
+            elapsed_seconds=time.perf_counter() - started,
+        )
+    except sqlite3.Error as exc:
+        raise ExecutionError(str(exc)) from exc
+    finally:
+        conn.close()
+        if part_path.exists():
+            part_path.unlink()
+
+
+async def export_blob(
+    db_path: Path,
+    table_name: str,
+    column: str,
+    rowid: int,
+    output_path: Path,
+    chunk_size: int = 1_048_576,
+) -> ExportResult:
+    """异步包装 BLOB 导出。"""
+    return await asyncio.to_thread(
+        _export_blob,
+        db_path,
+        table_name,
+        column,
+        rowid,
+        output_path,
+        chunk_size,
+    )
+
+
+async def export_sqlite(
+    db_path: Path,
+    statement: str,
+    output_path: Path,
+    export_format: str = "csv",
+    compress: bool = False,
+    chunk_size: int = 5000,
+    progress: Optional[ProgressCallback] = None,
+    policy: Optional[AdmissionPolicy] = None,
+) -> ExportResult:
+    """异步包装查询导出。"""
+    return await asyncio.to_thread(
+        _export_sqlite,
+        db_path,
+        statement,
+        output_path,
+        export_format,
+        compress,
+        chunk_size,
+        progress,
+        policy,
+    )
@@ -18,12 +18,19 @@ class ResultManager:
         settings = Settings()
         self.storage_path = Path(settings.storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.exports_path = self.storage_path / "exports"
+        self.exports_path.mkdir(parents=True, exist_ok=True)
 
     def _result_path(self, identifier: str) -> Path:
         """构造结果文件路径。"""
         safe_id = identifier.replace("/", "_")
         return self.storage_path / f"{safe_id}.json"
 
+    def export_path(self, identifier: str, suffix: str) -> Path:
+        """构造导出文件路径，`suffix` 形如 `.csv` 或 `.jsonl.gz`。"""
+        safe_id = identifier.replace("/", "_")
+        return self.exports_path / f"{safe_id}{suffix}"
+
     async def list_results(self) -> List[str]:
         """列出存储的结果标识。"""
         identifiers = [p.stem for p in self.storage_path.glob("*.json")]
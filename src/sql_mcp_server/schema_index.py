@@ -0,0 +1,280 @@
+"""数据库结构搜索索引，基于内存中的 SQLite FTS5。"""
+
+from __future__ import annotations
+
+import asyncio
+import difflib
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .db import ExecutionError, _connect, _quote_identifier, _schema_version
+
+_TOKEN_PATTERN = re.compile(r"[0-9A-Za-z\u0080-\uffff]+")
+SEARCH_KINDS = ("table", "view", "column")
+
+
+class SchemaSearchResult:
+    """封装一页搜索结果。"""
+
+    def __init__(
+        self,
+        columns: List[str],
+        rows: List[Dict[str, Any]],
+        total: int,
+        fuzzy_terms: Optional[List[str]] = None,
+    ):
+        self.columns = columns
+        self.rows = rows
+        self.total = total
+        self.fuzzy_terms = fuzzy_terms or []
+
+
+class SchemaIndex:
+    """单个数据库文件的结构索引。
+
+    表、视图与列各占一条 FTS5 记录；`schema_version` 变化时只重新索引
+    `sqlite_master` 中定义发生变化的对象，以及引用了这些对象的视图。
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self.schema_version: Optional[int] = None
+        self._objects: Dict[str, Tuple[str, str]] = {}
+        self._rowids: Dict[str, List[int]] = {}
+        self._view_tokens: Dict[str, Set[str]] = {}
+        self._token_views: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE VIRTUAL TABLE entries USING fts5(
+                kind UNINDEXED,
+                name,
+                parent UNINDEXED,
+                data_type,
+                definition,
+                prefix = '2 3'
+            );
+            CREATE VIRTUAL TABLE vocab USING fts5vocab(entries, 'row');
+            """
+        )
+
+    def refresh(self) -> None:
+        """在 `schema_version` 变化时增量更新索引。"""
+        version = _schema_version(self.db_path)
+        if version == self.schema_version:
+            return
+
+        source = _connect(self.db_path, read_only=True)
+        try:
+            current = {
+                str(name): (str(kind), sql or "")
+                for name, kind, sql in source.execute(
+                    """
+                    SELECT name, type, sql
+                    FROM sqlite_master
+                    WHERE type IN ('table', 'view')
+                      AND name NOT LIKE 'sqlite_%';
+                    """
+                )
+            }
+            changed = [name for name, entry in current.items() if self._objects.get(name) != entry]
+            removed = [name for name in self._objects if name not in current]
+            changed += self._dependent_views(set(changed) | set(removed))
+
+            columns: Dict[str, List[Tuple[str, str]]] = {}
+            for name in changed:
+                try:
+                    columns[name] = [
+                        (str(info[1]), str(info[2] or ""))
+                        for info in source.execute(
+                            f"PRAGMA table_info({_quote_identifier(name)});"
+                        )
+                    ]
+                except sqlite3.Error:
+                    # 视图引用的对象失效时无法解析列，仅索引对象本身
+                    columns[name] = []
+        except sqlite3.Error as exc:
+            raise ExecutionError(str(exc)) from exc
+        finally:
+            source.close()
+
+        with self._conn:
+            for name in removed + changed:
+                stale = self._rowids.pop(name, [])
+                self._conn.executemany(
+                    "DELETE FROM entries WHERE rowid = ?;",
+                    [(rowid,) for rowid in stale],
+                )
+                self._objects.pop(name, None)
+                self._forget_view(name)
+
+            for name in changed:
+                kind, sql = current[name]
+                rowids: List[int] = []
+                cur = self._conn.execute(
+                    "INSERT INTO entries (kind, name, parent, data_type, definition) "
+                    "VALUES (?, ?, ?, '', ?);",
+                    (kind, name, name, sql if kind == "view" else ""),
+                )
+                rowids.append(int(cur.lastrowid))
+                for column_name, column_type in columns[name]:
+                    cur = self._conn.execute(
+                        "INSERT INTO entries (kind, name, parent, data_type, definition) "
+                        "VALUES ('column', ?, ?, ?, '');",
+                        (column_name, name, column_type),
+                    )
+                    rowids.append(int(cur.lastrowid))
+                self._rowids[name] = rowids
+                self._objects[name] = current[name]
+                if kind == "view":
+                    tokens = {token.lower() for token in _TOKEN_PATTERN.findall(sql)}
+                    self._view_tokens[name] = tokens
+                    for token in tokens:
+                        self._token_views.setdefault(token, set()).add(name)
+
+        self.schema_version = version
+
+    def _dependent_views(self, dirty: Set[str]) -> List[str]:
+        """找出定义中引用了 `dirty` 对象的已索引视图，并沿视图之间的引用继续传递。
+
+        视图的列来自其引用的对象，这些对象变化时视图定义不变，需要单独重新读取列。
+        """
+        seen = set(dirty)
+        pending = dirty
+        dependents: List[str] = []
+        while pending:
+            mentioned: Set[str] = set()
+            for target in pending:
+                # 名称中含有分隔符时拆成多个词元，全部出现即视为引用
+                parts = [part.lower() for part in _TOKEN_PATTERN.findall(target)]
+                views = [self._token_views.get(part, set()) for part in parts]
+                mentioned.update(set.intersection(*views) if views else self._view_tokens)
+            pending = mentioned - seen
+            seen |= pending
+            dependents.extend(sorted(pending))
+        return dependents
+
+    def _forget_view(self, name: str) -> None:
+        for token in self._view_tokens.pop(name, set()):
+            views = self._token_views[token]
+            views.discard(name)
+            if not views:
+                del self._token_views[token]
+
+    def _fuzzy_terms(self, tokens: List[str]) -> List[str]:
+        vocabulary = [row[0] for row in self._conn.execute("SELECT term FROM vocab;")]
+        terms: List[str] = []
+        for token in tokens:
+            for term in difflib.get_close_matches(token, vocabulary, n=3, cutoff=0.7):
+                if term not in terms:
+                    terms.append(term)
+        return terms
+
+    def _match(
+        self,
+        match_expr: str,
+        kind: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        where = "entries MATCH ?"
+        params: List[Any] = [match_expr]
+        if kind:
+            where += " AND kind = ?"
+            params.append(kind)
+
+        total = int(
+            self._conn.execute(f"SELECT COUNT(*) FROM entries WHERE {where};", params).fetchone()[0]
+        )
+        rows = [
+            {"kind": row[0], "table": row[1], "name": row[2], "type": row[3]}
+            for row in self._conn.execute(
+                f"""
+                SELECT kind, parent, name, data_type
+                FROM entries
+                WHERE {where}
+                ORDER BY bm25(entries, 0, 10.0, 0, 1.0, 0.5), parent, name
+                LIMIT ? OFFSET ?;
+                """,
+                params + [limit, offset],
+            )
+        ]
+        return rows, total
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> SchemaSearchResult:
+        """按前缀匹配搜索，无结果时退化为基于词表的模糊匹配。"""
+        tokens = [token.lower() for token in _TOKEN_PATTERN.findall(query)]
+        columns = ["kind", "table", "name", "type"]
+        if not tokens:
+            return SchemaSearchResult(columns, [], 0)
+
+        with self._lock:
+            self.refresh()
+            prefix_expr = " AND ".join(f'"{token}"*' for token in tokens)
+            rows, total = self._match(prefix_expr, kind, limit, offset)
+            fuzzy_terms: List[str] = []
+            if total == 0:
+                fuzzy_terms = self._fuzzy_terms(tokens)
+                if fuzzy_terms:
+                    fuzzy_expr = " OR ".join(f'"{term}"' for term in fuzzy_terms)
+                    rows, total = self._match(fuzzy_expr, kind, limit, offset)
+
+        return SchemaSearchResult(columns, rows, total, fuzzy_terms)
+
+
+_INDEXES: Dict[str, SchemaIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _get_index(db_path: Path) -> SchemaIndex:
+    if not db_path.exists():
+        raise ExecutionError(f"数据库文件不存在: {db_path}")
+    path_key = db_path.resolve().as_posix()
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(path_key)
+        if index is None:
+            index = SchemaIndex(db_path)
+            _INDEXES[path_key] = index
+        return index
+
+
+def _search_schema(
+    db_path: Path,
+    query: str,
+    kind: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> SchemaSearchResult:
+    """在线程池中搜索数据库结构。"""
+    try:
+        return _get_index(db_path).search(query, kind, limit, offset)
+    except sqlite3.Error as exc:
+        raise ExecutionError(str(exc)) from exc
+
+
+async def search_schema(
+    db_path: Path,
+    query: str,
+    kind: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> SchemaSearchResult:
+    """异步包装结构搜索。"""
+    return await asyncio.to_thread(
+        _search_schema,
+        db_path,
+        query,
+        kind,
+        limit,
+        offset,
+    )
@@ -1,6 +1,6 @@
 """SQL MCP Server 主模块，参照 `arxiv_mcp_server.server`。"""
 
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import logging
 import mcp.types as types
 from mcp.server import Server
@@ -16,6 +16,20 @@ from .tools import (
     handle_list_tables,
     describe_table_tool,
     handle_describe_table,
+    profile_table_tool,
+    handle_profile_table,
+    search_schema_tool,
+    handle_search_schema,
+    export_query_tool,
+    handle_export_query,
+    begin_transaction_tool,
+    handle_begin_transaction,
+    commit_transaction_tool,
+    handle_commit_transaction,
+    rollback_transaction_tool,
+    handle_rollback_transaction,
+    read_blob_tool,
+    handle_read_blob,
 )
 from .prompts import list_prompts as prompt_list_handler
 from .prompts import get_prompt as prompt_get_handler
@@ -43,7 +57,36 @@ async def get_prompt(
 @server.list_tools()
 async def list_tools() -> List[types.Tool]:
     """注册 SQL 工具合集。"""
-    return [run_query_tool, list_tables_tool, describe_table_tool]
+    return [
+        run_query_tool,
+        list_tables_tool,
+        describe_table_tool,
+        profile_table_tool,
+        search_schema_tool,
+        export_query_tool,
+        begin_transaction_tool,
+        commit_transaction_tool,
+        rollback_transaction_tool,
+        read_blob_tool,
+    ]
+
+
+def _progress_reporter() -> Optional[Callable[[int], Awaitable[None]]]:
+    """客户端提供 progressToken 时，返回发送进度通知的回调。"""
+    try:
+        ctx = server.request_context
+    except LookupError:
+        return None
+    if ctx.meta is None or ctx.meta.progressToken is None:
+        return None
+    token = ctx.meta.progressToken
+
+    async def report(progress: int) -> None:
+        await ctx.session.send_progress_notification(
+            token, progress, message=f"{progress} rows"
+        )
+
+    return report
 
 
 @server.call_tool()
@@ -57,6 +100,20 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextCont
             return await handle_list_tables(arguments)
         if name == describe_table_tool.name:
             return await handle_describe_table(arguments)
+        if name == profile_table_tool.name:
+            return await handle_profile_table(arguments)
+        if name == search_schema_tool.name:
+            return await handle_search_schema(arguments)
+        if name == export_query_tool.name:
+            return await handle_export_query(arguments, _progress_reporter())
+        if name == begin_transaction_tool.name:
+            return await handle_begin_transaction(arguments)
+        if name == commit_transaction_tool.name:
+            return await handle_commit_transaction(arguments)
+        if name == rollback_transaction_tool.name:
+            return await handle_rollback_transaction(arguments)
+        if name == read_blob_tool.name:
+            return await handle_read_blob(arguments)
         return [
             types.TextContent(
                 type="text",
@@ -3,6 +3,18 @@
 from .run_query import run_query_tool, handle_run_query
 from .list_tables import list_tables_tool, handle_list_tables
 from .describe_table import describe_table_tool, handle_describe_table
+from .profile_table import profile_table_tool, handle_profile_table
+from .search_schema import search_schema_tool, handle_search_schema
+from .export_query import export_query_tool, handle_export_query
+from .transactions import (
+    begin_transaction_tool,
+    handle_begin_transaction,
+    commit_transaction_tool,
+    handle_commit_transaction,
+    rollback_transaction_tool,
+    handle_rollback_transaction,
+)
+from .read_blob import read_blob_tool, handle_read_blob
 
 __all__ = [
     "run_query_tool",
@@ -11,4 +23,18 @@ __all__ = [
     "handle_list_tables",
     "describe_table_tool",
     "handle_describe_table",
+    "profile_table_tool",
+    "handle_profile_table",
+    "search_schema_tool",
+    "handle_search_schema",
+    "export_query_tool",
+    "handle_export_query",
+    "begin_transaction_tool",
+    "handle_begin_transaction",
+    "commit_transaction_tool",
+    "handle_commit_transaction",
+    "rollback_transaction_tool",
+    "handle_rollback_transaction",
+    "read_blob_tool",
+    "handle_read_blob",
 ]
@@ -0,0 +1,145 @@
+"""将查询结果流式导出到文件的工具定义。"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import mcp.types as types
+
+from ..config import Settings
+from ..db import AdmissionPolicy, ExecutionError
+from ..export import EXPORT_FORMATS, export_sqlite
+from ..resources import ResultManager
+
+logger = logging.getLogger("sql-mcp-server")
+settings = Settings()
+
+export_query_tool = types.Tool(
+    name="export_query",
+    description=(
+        "执行查询并将全部结果流式写入存储目录下的文件（CSV 或 JSONL，可 gzip 压缩），"
+        "不受 `MAX_ROWS` 限制，返回文件路径、行数与 SHA-256 校验和。"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "statement": {
+                "type": "string",
+                "description": "要导出的 SQL 查询语句。",
+            },
+            "format": {
+                "type": "string",
+                "enum": list(EXPORT_FORMATS),
+                "description": "导出格式，默认 csv。",
+            },
+            "compress": {
+                "type": "boolean",
+                "description": "是否使用 gzip 压缩输出文件。",
+            },
+            "confirm": {
+                "type": "boolean",
+                "description": "确认执行估算代价超过预算的语句。",
+            },
+            "file_name": {
+                "type": "string",
+                "description": "导出文件名（不含扩展名），留空时自动生成。",
+            },
+            "database_path": {
+                "type": "string",
+                "description": "SQLite 数据库文件路径，留空时使用默认配置。",
+            },
+        },
+        "required": ["statement"],
+    },
+)
+
+ProgressReporter = Callable[[int], Awaitable[None]]
+
+
+def _resolve_db_path(arguments: Dict[str, Any]) -> Optional[Path]:
+    if db_arg := arguments.get("database_path"):
+        return Path(db_arg).expanduser().resolve()
+    return settings.database_path
+
+
+def _default_identifier() -> str:
+    return f"export-{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+async def handle_export_query(
+    arguments: Dict[str, Any],
+    report_progress: Optional[ProgressReporter] = None,
+) -> List[types.TextContent]:
+    statement = arguments.get("statement")
+    if not isinstance(statement, str) or not statement.strip():
+        error_msg = "请提供有效的 `statement`。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    export_format = arguments.get("format") or "csv"
+    if export_format not in EXPORT_FORMATS:
+        error_msg = f"`format` 仅支持 {', '.join(EXPORT_FORMATS)}。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+    compress = bool(arguments.get("compress"))
+
+    db_path = _resolve_db_path(arguments)
+    if not db_path:
+        error_msg = "未配置数据库路径，请在参数中提供 `database_path` 或设置默认路径。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    identifier = Path(str(arguments.get("file_name") or "")).name or _default_identifier()
+    suffix = f".{export_format}" + (".gz" if compress else "")
+    output_path = ResultManager().export_path(identifier, suffix)
+    if output_path.exists():
+        error_msg = f"导出文件已存在: {output_path}，请更换 `file_name`。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    loop = asyncio.get_running_loop()
+
+    def on_progress(row_count: int) -> None:
+        logger.debug("导出进度: %d 行", row_count)
+        if report_progress is not None:
+            asyncio.run_coroutine_threadsafe(report_progress(row_count), loop)
+
+    try:
+        policy = AdmissionPolicy(
+            settings.QUERY_COST_BUDGET,
+            settings.DENIED_OPERATIONS,
+            confirmed=bool(arguments.get("confirm")),
+        )
+        result = await export_sqlite(
+            db_path,
+            statement,
+            output_path,
+            export_format,
+            compress,
+            settings.EXPORT_CHUNK_SIZE,
+            on_progress,
+            policy,
+        )
+    except ExecutionError as exc:
+        logger.error("导出查询失败: %s", exc)
+        return [types.TextContent(type="text", text=str(exc))]
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("未预期的导出异常")
+        return [types.TextContent(type="text", text=f"unexpected error: {exc}")]
+
+    logger.info("导出 %d 行至 %s", result.row_count, result.path)
+    output = "\n".join(
+        [
+            "**导出完成**",
+            f"- 文件: `{result.path}`",
+            f"- 行数: {result.row_count}",
+            f"- 列: {', '.join(result.columns)}",
+            f"- 大小: {result.size_bytes} bytes",
+            f"- SHA-256: `{result.sha256}`",
+            f"- 耗时: {result.elapsed_seconds:.2f}s",
+        ]
+    )
+    return [types.TextContent(type="text", text=output)]
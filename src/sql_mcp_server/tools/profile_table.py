@@ -0,0 +1,174 @@
+"""表数据统计概览工具定义。"""
+
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import mcp.types as types
+
+from ..config import Settings
+from ..db import (
+    ExecutionError,
+    TableProfile,
+    get_data_version,
+    profile_sqlite,
+)
+from .run_query import _format_result
+
+logger = logging.getLogger("sql-mcp-server")
+settings = Settings()
+
+DEFAULT_TOP_K = 5
+MAX_TOP_K = 20
+PREVIEW_LENGTH = 40
+
+# 缓存键包含 data_version，数据库被其他连接修改后旧条目自然失效
+_profile_cache: "OrderedDict[Tuple[Any, ...], TableProfile]" = OrderedDict()
+
+profile_table_tool = types.Tool(
+    name="profile_table",
+    description=(
+        "统计表或视图每一列的行数、空值比例、不同值数量、最小/最大值与高频值，"
+        "结果按数据版本缓存。"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "table_name": {
+                "type": "string",
+                "description": "要统计的表或视图名称。",
+            },
+            "top_k": {
+                "type": "integer",
+                "description": f"每列返回的高频值个数，默认 {DEFAULT_TOP_K}，最大 {MAX_TOP_K}。",
+            },
+            "sample_percent": {
+                "type": "number",
+                "description": "采样百分比 (0, 100)，用于超大表；留空时统计全部行。",
+            },
+            "database_path": {
+                "type": "string",
+                "description": "SQLite 数据库文件路径，留空时使用默认配置。",
+            },
+        },
+        "required": ["table_name"],
+    },
+)
+
+
+def _resolve_db_path(arguments: Dict[str, Any]) -> Optional[Path]:
+    if db_arg := arguments.get("database_path"):
+        return Path(db_arg).expanduser().resolve()
+    return settings.database_path
+
+
+def _preview(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray)):
+        return f"<blob {len(value)} bytes>"
+    text = str(value)
+    if len(text) > PREVIEW_LENGTH:
+        text = text[: PREVIEW_LENGTH - 3] + "..."
+    return text
+
+
+def _format_profile(profile: TableProfile, cached: bool) -> str:
+    total = profile.scanned_rows
+    if profile.sample_percent:
+        summary = (
+            f"- 估计行数: ~{profile.estimated_rows}"
+            f"（采样 {profile.sample_percent:g}%，扫描 {total} 行）"
+        )
+    else:
+        summary = f"- 行数: {total}"
+    if cached:
+        summary += "\n- _结果来自缓存_"
+
+    rows: List[Dict[str, Any]] = []
+    for column in profile.columns:
+        null_ratio = column.null_count / total if total else 0.0
+        distinct = str(column.distinct_estimate)
+        if not column.distinct_exact:
+            distinct = f"~{distinct}"
+        top_prefix = "" if column.top_exact else "~"
+        top_values = ", ".join(
+            f"{_preview(value)} ({top_prefix}{count})"
+            for value, count in column.top_values
+        )
+        rows.append(
+            {
+                "column": column.name,
+                "type": column.declared_type,
+                "nulls": column.null_count,
+                "null_ratio": f"{null_ratio:.2%}",
+                "distinct": distinct,
+                "min": _preview(column.minimum),
+                "max": _preview(column.maximum),
+                "top_values": top_values,
+            }
+        )
+
+    table_text = _format_result(
+        ["column", "type", "nulls", "null_ratio", "distinct", "min", "max", "top_values"],
+        rows,
+    )
+    return f"**`{profile.table_name}` 统计概览**\n{summary}\n\n{table_text}"
+
+
+async def handle_profile_table(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    raw_table_name = arguments.get("table_name")
+    if not isinstance(raw_table_name, str) or not raw_table_name.strip():
+        error_msg = "请提供有效的 `table_name`。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+    table_name = raw_table_name.strip()
+
+    top_k = DEFAULT_TOP_K
+    top_k_arg = arguments.get("top_k")
+    if isinstance(top_k_arg, int) and top_k_arg > 0:
+        top_k = min(top_k_arg, MAX_TOP_K)
+
+    sample_percent: Optional[float] = None
+    sample_arg = arguments.get("sample_percent")
+    if sample_arg is not None:
+        if not isinstance(sample_arg, (int, float)) or not 0 < sample_arg <= 100:
+            error_msg = "`sample_percent` 必须是 (0, 100] 之间的数值。"
+            logger.error(error_msg)
+            return [types.TextContent(type="text", text=error_msg)]
+        if sample_arg < 100:
+            sample_percent = float(sample_arg)
+
+    db_path = _resolve_db_path(arguments)
+    if not db_path:
+        error_msg = "未配置数据库路径，请在参数中提供 `database_path` 或设置默认路径。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    try:
+        data_version = await get_data_version(db_path)
+        cache_key = (db_path.as_posix(), data_version, table_name, top_k, sample_percent)
+        profile = _profile_cache.get(cache_key)
+        cached = profile is not None
+        if profile is None:
+            profile = await profile_sqlite(
+                db_path,
+                table_name,
+                top_k,
+                sample_percent,
+                settings.READ_ONLY,
+                settings.PROFILE_SKETCH_ROWS,
+            )
+            _profile_cache[cache_key] = profile
+            while len(_profile_cache) > settings.PROFILE_CACHE_SIZE:
+                _profile_cache.popitem(last=False)
+        else:
+            _profile_cache.move_to_end(cache_key)
+        return [types.TextContent(type="text", text=_format_profile(profile, cached))]
+    except ExecutionError as exc:
+        logger.error("统计表数据失败: %s", exc)
+        return [types.TextContent(type="text", text=str(exc))]
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("未预期的统计异常")
+        return [types.TextContent(type="text", text=f"unexpected error: {exc}")]
@@ -0,0 +1,152 @@
+"""按字节范围读取 BLOB / 大文本值的工具定义。"""
+
+import base64
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import mcp.types as types
+
+from ..config import Settings
+from ..db import ExecutionError, read_blob
+from ..export import export_blob
+from ..resources import ResultManager
+
+logger = logging.getLogger("sql-mcp-server")
+settings = Settings()
+
+DEFAULT_READ_LENGTH = 65536
+BLOB_ENCODINGS = ("base64", "hex", "text")
+
+read_blob_tool = types.Tool(
+    name="read_blob",
+    description=(
+        "使用增量 BLOB I/O 按字节范围读取指定表、列与 rowid 的 BLOB 或大文本值，"
+        "也可将完整值分块导出到存储目录，不会一次性加载整个值。"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "table_name": {
+                "type": "string",
+                "description": "值所在的表名（需为 rowid 表）。",
+            },
+            "column": {
+                "type": "string",
+                "description": "值所在的列名。",
+            },
+            "rowid": {
+                "type": "integer",
+                "description": "值所在行的 rowid。",
+            },
+            "offset": {
+                "type": "integer",
+                "description": "起始字节偏移，默认 0。",
+            },
+            "length": {
+                "type": "integer",
+                "description": f"读取字节数，默认 {DEFAULT_READ_LENGTH}，不超过 `MAX_BLOB_READ_BYTES`。",
+            },
+            "encoding": {
+                "type": "string",
+                "enum": list(BLOB_ENCODINGS),
+                "description": "返回内容的编码，默认 base64；text 按 UTF-8 解码。",
+            },
+            "export": {
+                "type": "boolean",
+                "description": "为 true 时将完整值写入文件并返回路径，忽略 offset/length。",
+            },
+            "database_path": {
+                "type": "string",
+                "description": "SQLite 数据库文件路径，留空时使用默认配置。",
+            },
+        },
+        "required": ["table_name", "column", "rowid"],
+    },
+)
+
+
+def _resolve_db_path(arguments: Dict[str, Any]) -> Optional[Path]:
+    if db_arg := arguments.get("database_path"):
+        return Path(db_arg).expanduser().resolve()
+    return settings.database_path
+
+
+def _encode(data: bytes, encoding: str) -> str:
+    if encoding == "hex":
+        return data.hex()
+    if encoding == "text":
+        return data.decode("utf-8", errors="replace")
+    return base64.b64encode(data).decode("ascii")
+
+
+async def handle_read_blob(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    table_name = arguments.get("table_name")
+    column = arguments.get("column")
+    rowid = arguments.get("rowid")
+    if not isinstance(table_name, str) or not table_name.strip():
+        error_msg = "请提供有效的 `table_name`。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+    if not isinstance(column, str) or not column.strip():
+        error_msg = "请提供有效的 `column`。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+    if not isinstance(rowid, int):
+        error_msg = "请提供整数类型的 `rowid`。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+    table_name = table_name.strip()
+    column = column.strip()
+
+    encoding = arguments.get("encoding") or "base64"
+    if encoding not in BLOB_ENCODINGS:
+        error_msg = f"`encoding` 仅支持 {', '.join(BLOB_ENCODINGS)}。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    offset = 0
+    offset_arg = arguments.get("offset")
+    if isinstance(offset_arg, int) and offset_arg > 0:
+        offset = offset_arg
+
+    length = min(DEFAULT_READ_LENGTH, settings.MAX_BLOB_READ_BYTES)
+    length_arg = arguments.get("length")
+    if isinstance(length_arg, int) and length_arg > 0:
+        length = min(length_arg, settings.MAX_BLOB_READ_BYTES)
+
+    db_path = _resolve_db_path(arguments)
+    if not db_path:
+        error_msg = "未配置数据库路径，请在参数中提供 `database_path` 或设置默认路径。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    try:
+        if arguments.get("export"):
+            identifier = f"{table_name}-{column}-{rowid}-{uuid.uuid4().hex[:6]}"
+            output_path = ResultManager().export_path(identifier, ".bin")
+            exported = await export_blob(db_path, table_name, column, rowid, output_path)
+            output = "\n".join(
+                [
+                    "**导出完成**",
+                    f"- 文件: `{exported.path}`",
+                    f"- 大小: {exported.size_bytes} bytes",
+                    f"- SHA-256: `{exported.sha256}`",
+                ]
+            )
+            return [types.TextContent(type="text", text=output)]
+
+        chunk = await read_blob(db_path, table_name, column, rowid, offset, length)
+    except ExecutionError as exc:
+        logger.error("读取 BLOB 失败: %s", exc)
+        return [types.TextContent(type="text", text=str(exc))]
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("未预期的 BLOB 读取异常")
+        return [types.TextContent(type="text", text=f"unexpected error: {exc}")]
+
+    header = f"字节 {chunk.offset}-{chunk.end} / 共 {chunk.total_size} bytes（{encoding}）"
+    if chunk.end < chunk.total_size:
+        header = f"{header}，使用 `offset={chunk.end}` 继续读取"
+    output = f"_{header}_\n\n```\n{_encode(chunk.data, encoding)}\n```"
+    return [types.TextContent(type="text", text=output)]
@@ -6,7 +6,12 @@ from typing import Any, Dict, List, Optional
 import mcp.types as types
 
 from ..config import Settings
-from ..db import execute_sqlite, ExecutionError
+from ..db import (
+    AdmissionPolicy,
+    execute_sqlite,
+    execute_in_transaction,
+    ExecutionError,
+)
 
 logger = logging.getLogger("sql-mcp-server")
 settings = Settings()
@@ -29,6 +34,14 @@ run_query_tool = types.Tool(
                 "type": "string",
                 "description": "SQLite 数据库文件路径，留空时使用默认配置。",
             },
+            "confirm": {
+                "type": "boolean",
+                "description": "确认执行估算代价超过预算的语句。",
+            },
+            "transaction_id": {
+                "type": "string",
+                "description": "`begin_transaction` 返回的事务句柄，提供时在该事务中执行且忽略 `database_path`。",
+            },
         },
         "required": ["statement"],
     },
@@ -70,19 +83,29 @@ async def handle_run_query(arguments: Dict[str, Any]) -> List[types.TextContent]
     if isinstance(max_rows_arg, int) and max_rows_arg > 0:
         max_rows = min(max_rows_arg, settings.MAX_ROWS)
 
+    transaction_id = arguments.get("transaction_id")
     db_path = _resolve_db_path(arguments)
-    if not db_path:
+    if not transaction_id and not db_path:
         error_msg = "未配置数据库路径，请在参数中提供 `database_path` 或设置默认路径。"
         logger.error(error_msg)
         return [types.TextContent(type="text", text=error_msg)]
 
     try:
-        result = await execute_sqlite(
-            db_path,
-            statement,
-            max_rows,
-            settings.READ_ONLY,
+        policy = AdmissionPolicy(
+            settings.QUERY_COST_BUDGET,
+            settings.DENIED_OPERATIONS,
+            confirmed=bool(arguments.get("confirm")),
         )
+        if transaction_id:
+            result = await execute_in_transaction(transaction_id, statement, max_rows, policy)
+        else:
+            result = await execute_sqlite(
+                db_path,
+                statement,
+                max_rows,
+                settings.READ_ONLY,
+                policy,
+            )
         output = _format_result(result.columns, result.rows)
         if result.truncated:
             output = f"{output}\n\n_其余部分已截断..._"
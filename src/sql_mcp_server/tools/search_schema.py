@@ -0,0 +1,114 @@
+"""数据库结构搜索工具定义。"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import mcp.types as types
+
+from ..config import Settings
+from ..db import ExecutionError
+from ..schema_index import SEARCH_KINDS, search_schema
+from .run_query import _format_result
+
+logger = logging.getLogger("sql-mcp-server")
+settings = Settings()
+
+DEFAULT_PAGE_SIZE = 50
+
+search_schema_tool = types.Tool(
+    name="search_schema",
+    description=(
+        "按关键字搜索表名、列名、列类型与视图定义，支持前缀与模糊匹配及分页，"
+        "适用于包含大量表的数据库。"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "搜索关键字，多个词之间为 AND 关系，每个词按前缀匹配。",
+            },
+            "kind": {
+                "type": "string",
+                "enum": list(SEARCH_KINDS),
+                "description": "仅返回指定类型的对象。",
+            },
+            "limit": {
+                "type": "integer",
+                "description": f"每页返回条数，默认 {DEFAULT_PAGE_SIZE}。",
+            },
+            "offset": {
+                "type": "integer",
+                "description": "分页偏移量，默认 0。",
+            },
+            "database_path": {
+                "type": "string",
+                "description": "SQLite 数据库文件路径，留空时使用默认配置。",
+            },
+        },
+        "required": ["query"],
+    },
+)
+
+
+def _resolve_db_path(arguments: Dict[str, Any]) -> Optional[Path]:
+    if db_arg := arguments.get("database_path"):
+        return Path(db_arg).expanduser().resolve()
+    return settings.database_path
+
+
+async def handle_search_schema(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    query = arguments.get("query")
+    if not isinstance(query, str) or not query.strip():
+        error_msg = "请提供有效的 `query`。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    kind = arguments.get("kind") or None
+    if kind is not None and kind not in SEARCH_KINDS:
+        error_msg = f"`kind` 仅支持 {', '.join(SEARCH_KINDS)}。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    limit = min(DEFAULT_PAGE_SIZE, settings.MAX_ROWS)
+    limit_arg = arguments.get("limit")
+    if isinstance(limit_arg, int) and limit_arg > 0:
+        limit = min(limit_arg, settings.MAX_ROWS)
+
+    offset = 0
+    offset_arg = arguments.get("offset")
+    if isinstance(offset_arg, int) and offset_arg > 0:
+        offset = offset_arg
+
+    db_path = _resolve_db_path(arguments)
+    if not db_path:
+        error_msg = "未配置数据库路径，请在参数中提供 `database_path` 或设置默认路径。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    try:
+        result = await search_schema(db_path, query, kind, limit, offset)
+    except ExecutionError as exc:
+        logger.error("搜索数据库结构失败: %s", exc)
+        return [types.TextContent(type="text", text=str(exc))]
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("未预期的结构搜索异常")
+        return [types.TextContent(type="text", text=f"unexpected error: {exc}")]
+
+    if not result.rows:
+        text = f"_未找到与 `{query}` 匹配的对象。_"
+        if result.total and offset:
+            text = f"_共 {result.total} 条结果，偏移量 {offset} 超出范围。_"
+        return [types.TextContent(type="text", text=text)]
+
+    sections: List[str] = []
+    if result.fuzzy_terms:
+        sections.append(f"_未找到精确匹配，按近似词 {', '.join(result.fuzzy_terms)} 搜索。_")
+    sections.append(_format_result(result.columns, result.rows))
+    shown_until = offset + len(result.rows)
+    footer = f"_第 {offset + 1}-{shown_until} 条，共 {result.total} 条。_"
+    if shown_until < result.total:
+        footer = f"{footer[:-2]}，使用 `offset={shown_until}` 查看下一页。_"
+    sections.append(footer)
+    return [types.TextContent(type="text", text="\n\n".join(sections))]
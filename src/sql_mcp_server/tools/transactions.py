@@ -0,0 +1,138 @@
+"""跨多次调用的显式事务工具定义。"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import mcp.types as types
+
+from ..config import Settings
+from ..db import (
+    TRANSACTION_MODES,
+    ExecutionError,
+    begin_transaction,
+    commit_transaction,
+    rollback_transaction,
+)
+
+logger = logging.getLogger("sql-mcp-server")
+settings = Settings()
+
+_TRANSACTION_ID_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "transaction_id": {
+            "type": "string",
+            "description": "`begin_transaction` 返回的事务句柄。",
+        },
+    },
+    "required": ["transaction_id"],
+}
+
+begin_transaction_tool = types.Tool(
+    name="begin_transaction",
+    description=(
+        "开始一个固定在单个连接上的事务并返回句柄；将句柄传给 `run_query` 的 "
+        "`transaction_id` 可在同一事务中执行多条语句，空闲超时后自动回滚。"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "mode": {
+                "type": "string",
+                "enum": list(TRANSACTION_MODES),
+                "description": "BEGIN 模式，默认 immediate（只读模式下为 deferred）。",
+            },
+            "database_path": {
+                "type": "string",
+                "description": "SQLite 数据库文件路径，留空时使用默认配置。",
+            },
+        },
+        "required": [],
+    },
+)
+
+commit_transaction_tool = types.Tool(
+    name="commit_transaction",
+    description="提交事务并释放其连接。",
+    inputSchema=_TRANSACTION_ID_SCHEMA,
+)
+
+rollback_transaction_tool = types.Tool(
+    name="rollback_transaction",
+    description="回滚事务并释放其连接。",
+    inputSchema=_TRANSACTION_ID_SCHEMA,
+)
+
+
+def _resolve_db_path(arguments: Dict[str, Any]) -> Optional[Path]:
+    if db_arg := arguments.get("database_path"):
+        return Path(db_arg).expanduser().resolve()
+    return settings.database_path
+
+
+async def handle_begin_transaction(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    mode = arguments.get("mode") or ("deferred" if settings.READ_ONLY else "immediate")
+    if mode not in TRANSACTION_MODES:
+        error_msg = f"`mode` 仅支持 {', '.join(TRANSACTION_MODES)}。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    db_path = _resolve_db_path(arguments)
+    if not db_path:
+        error_msg = "未配置数据库路径，请在参数中提供 `database_path` 或设置默认路径。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+
+    try:
+        transaction_id = await begin_transaction(
+            db_path,
+            settings.READ_ONLY,
+            mode,
+            settings.MAX_TRANSACTIONS,
+            settings.TRANSACTION_TIMEOUT_SECONDS,
+        )
+    except ExecutionError as exc:
+        logger.error("开始事务失败: %s", exc)
+        return [types.TextContent(type="text", text=str(exc))]
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("未预期的事务异常")
+        return [types.TextContent(type="text", text=f"unexpected error: {exc}")]
+
+    output = (
+        f"事务已开始，`transaction_id`: `{transaction_id}`\n\n"
+        f"_空闲超过 {settings.TRANSACTION_TIMEOUT_SECONDS} 秒将自动回滚。_"
+    )
+    return [types.TextContent(type="text", text=output)]
+
+
+async def _handle_finish(arguments: Dict[str, Any], commit: bool) -> List[types.TextContent]:
+    transaction_id = arguments.get("transaction_id")
+    if not isinstance(transaction_id, str) or not transaction_id.strip():
+        error_msg = "请提供有效的 `transaction_id`。"
+        logger.error(error_msg)
+        return [types.TextContent(type="text", text=error_msg)]
+    transaction_id = transaction_id.strip()
+
+    action = "提交" if commit else "回滚"
+    try:
+        if commit:
+            await commit_transaction(transaction_id)
+        else:
+            await rollback_transaction(transaction_id)
+    except ExecutionError as exc:
+        logger.error("%s事务失败: %s", action, exc)
+        return [types.TextContent(type="text", text=str(exc))]
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("未预期的事务异常")
+        return [types.TextContent(type="text", text=f"unexpected error: {exc}")]
+
+    return [types.TextContent(type="text", text=f"事务 `{transaction_id}` 已{action}。")]
+
+
+async def handle_commit_transaction(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    return await _handle_finish(arguments, commit=True)
+
+
+async def handle_rollback_transaction(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    return await _handle_finish(arguments, commit=False)